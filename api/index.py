@@ -1,5 +1,4 @@
 # Vercel-compatible Flask app for nanomaterial toxicity prediction
-import sys
 import os
 import warnings
 
@@ -7,11 +6,17 @@ import warnings
 warnings.filterwarnings('ignore', category=UserWarning, module='joblib')
 
 from flask import Flask, request, jsonify, render_template, send_from_directory
+from flask.json.provider import JSONProvider
+from flask_compress import Compress
 import numpy as np
-import pickle
+import orjson
+import joblib
+import hashlib
 import time
-import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 
 # Get the directory of this file
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -22,25 +27,241 @@ app = Flask(__name__,
            template_folder=os.path.join(project_root, 'templates'),
            static_folder=os.path.join(project_root, 'static'))
 
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson, which serializes numpy scalars and arrays natively"""
+    option = orjson.OPT_SERIALIZE_NUMPY
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+app.json = OrjsonProvider(app)
+
 # Configure app for production
 app.config['ENV'] = 'production'
 app.config['DEBUG'] = False
 app.config['TESTING'] = False
 
+# Compress larger responses such as /detailed-analysis before they leave the function
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 500
+Compress(app)
+
+# Input thresholds that raise a feature's risk level in /detailed-analysis above
+# 'Low', as (feature, comparison, threshold, risk level)
+FEATURE_RISK_RULES = (
+    ('particle_size_nm', '<', 50, 'High'),
+    ('surface_area_m2g', '>', 200, 'Medium'),
+    ('concentration_mgl', '>', 500, 'High'),
+    ('zeta_potential_mv', 'abs<', 15, 'Medium')
+)
+
+# Input thresholds that flag a risk factor in /predict, as
+# (feature, comparison, threshold, message)
+RISK_FACTOR_RULES = (
+    ('particle_size_nm', '<', 50, 'Small particle size increases bioavailability'),
+    ('surface_area_m2g', '>', 100, 'High surface area enhances reactivity'),
+    ('concentration_mgl', '>', 100, 'High concentration increases exposure risk'),
+    ('material_type', '==', 1, 'Metal nanoparticles can have higher toxicity'),
+    ('aspect_ratio', '>', 10, 'High aspect ratio (fiber-like) may cause inflammation')
+)
+
+# Input thresholds that trigger a safety recommendation in /detailed-analysis
+RECOMMENDATION_RULES = (
+    ('particle_size_nm', '<', 50, 'Consider larger particle sizes to reduce bioavailability'),
+    ('concentration_mgl', '>', 500, 'Reduce concentration to minimize exposure risk'),
+    ('surface_area_m2g', '>', 200, 'Monitor surface reactivity due to high surface area')
+)
+
+# Largest number of samples /predict-batch scores in one request; the compiled
+# forest's traversal arrays grow with samples × trees
+MAX_BATCH_SIZE = 1000
+
 # Global variables for model and scaler
 model = None
 scaler = None
 feature_info = None
+feature_names = ()
+feature_descriptions = ()
+n_features = 0
+scaler_mean = None
+scaler_inv_scale = None
+feature_importances = None
+top_feature_importance = {}
+feature_importance_chart = []
+compiled_forest = None
+model_size_kb = 0.0
+risk_factor_table = None
+recommendation_table = None
+feature_risk_table = None
+features_body = None
+model_info_body = None
+
+# Per-thread input row reused across requests; the dev server and threaded
+# WSGI workers serve requests concurrently, so the buffer can't be shared
+_thread_buffers = threading.local()
+
+# SHA-256 of nanomaterial_toxicity_model.pkl. The forest is still a pickle, so
+# it is only unpickled if it matches the artifact shipped with this app; update
+# this after retraining.
+MODEL_SHA256 = 'bee5ce6be4155e3d39b745e4761a75a053d86cb275cccbb0f831c4dfc6615952'
+
+def _file_sha256(path):
+    """Hex SHA-256 digest of a file, read in 1 MiB chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _load_model_file(path):
+    """Unpickle the forest after checking it against MODEL_SHA256"""
+    model_sha256 = _file_sha256(path)
+    if model_sha256 != MODEL_SHA256:
+        raise ValueError(f"checksum mismatch: {model_sha256}")
+    return joblib.load(path)
+
+def _load_scaler_file(path):
+    """Read the StandardScaler mean and scale arrays; no pickle involved"""
+    with np.load(path) as scaler_arrays:
+        return {key: scaler_arrays[key] for key in ('mean', 'scale')}
+
+def _load_feature_info_file(path):
+    """Read the feature names and descriptions"""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+def compile_forest(forest):
+    """Flatten a random forest into node arrays with (right, left) children per node, self-looping leaves and a fixed depth of steps"""
+    trees = [estimator.tree_ for estimator in forest.estimators_]
+    offsets = np.cumsum([0] + [tree.node_count for tree in trees[:-1]])
+    
+    children, feature, threshold, value = [], [], [], []
+    for offset, tree in zip(offsets, trees):
+        nodes = np.arange(tree.node_count) + offset
+        is_leaf = tree.children_left == -1
+        children.append(np.column_stack([
+            np.where(is_leaf, nodes, tree.children_right + offset),
+            np.where(is_leaf, nodes, tree.children_left + offset)
+        ]))
+        feature.append(np.where(is_leaf, 0, tree.feature))
+        threshold.append(tree.threshold)
+        leaf_value = tree.value[:, 0, :]
+        normalizer = leaf_value.sum(axis=1, keepdims=True)
+        normalizer[normalizer == 0] = 1
+        value.append(leaf_value / normalizer)
+    
+    return {
+        'roots': offsets.astype(np.intp),
+        'children': np.concatenate(children).astype(np.intp),
+        'feature': np.concatenate(feature).astype(np.intp),
+        'threshold': np.concatenate(threshold),
+        'value': np.concatenate(value),
+        'depth': max(tree.max_depth for tree in trees)
+    }
+
+def compile_threshold_rules(rules):
+    """Turn (feature, comparison, threshold, outcome) rules into arrays over feature positions"""
+    rules = [rule for rule in rules if rule[0] in feature_names]
+    ops = {'abs<': -2, '<': -1, '==': 0, '>': 1}
+    return {
+        'index': np.array([feature_names.index(rule[0]) for rule in rules], dtype=np.intp),
+        'op': np.array([ops[rule[1]] for rule in rules]),
+        'threshold': np.array([rule[2] for rule in rules], dtype=np.float64),
+        'outcomes': np.array([rule[3] for rule in rules], dtype=object)
+    }
+
+def threshold_rule_hits(table, values):
+    """Boolean mask of the compiled rules crossed by a row of raw feature values"""
+    selected = values[table['index']]
+    threshold = table['threshold']
+    op = table['op']
+    selected = np.where(op == -2, np.abs(selected), selected)
+    return np.where(op < 0, selected < threshold,
+                    np.where(op > 0, selected > threshold, selected == threshold))
+
+def match_threshold_rules(table, values):
+    """Outcomes of every rule whose threshold is crossed by a row of raw feature values"""
+    return table['outcomes'][threshold_rule_hits(table, values)].tolist()
+
+def scale_features(features_array, copy=True):
+    """Standardize raw features as float32 without sklearn's validation, in place when copy=False and the input is float32"""
+    features_scaled = features_array.astype(np.float32, copy=copy)
+    features_scaled -= scaler_mean
+    features_scaled *= scaler_inv_scale
+    return features_scaled
+
+def forest_predict_proba(features_scaled):
+    """Class probabilities for scaled features, using the compiled forest when available"""
+    if compiled_forest is None:
+        return model.predict_proba(features_scaled)
+    
+    forest = compiled_forest
+    # sklearn compares float32 inputs against float64 thresholds
+    X = np.asarray(features_scaled, dtype=np.float32)
+    
+    # NaN fails every <= comparison and would always go right, while sklearn
+    # routes missing values its own way, so leave those rows to sklearn
+    missing = np.isnan(X).any(axis=1)
+    if missing.any():
+        proba = np.empty((X.shape[0], forest['value'].shape[1]))
+        proba[missing] = model.predict_proba(X[missing])
+        if not missing.all():
+            proba[~missing] = forest_predict_proba(X[~missing])
+        return proba
+    
+    rows = np.arange(X.shape[0])[:, None]
+    node = np.broadcast_to(forest['roots'], (X.shape[0], forest['roots'].shape[0]))
+    
+    for _ in range(forest['depth']):
+        go_left = X[rows, forest['feature'][node]] <= forest['threshold'][node]
+        node = forest['children'][node, go_left.view(np.uint8)]
+    
+    return forest['value'][node].mean(axis=1)
+
+def feature_buffer():
+    """This thread's (1, n_features) float64 row for request inputs"""
+    buffer = getattr(_thread_buffers, 'features', None)
+    if buffer is None or buffer.shape[1] != n_features:
+        buffer = _thread_buffers.features = np.empty((1, n_features), dtype=np.float64)
+    return buffer
+
+def non_finite_feature(features_array):
+    """(row, feature name) of the first value that isn't finite as float32, or None"""
+    with np.errstate(over='ignore'):
+        invalid = ~np.isfinite(features_array.astype(np.float32, copy=False))
+    if not invalid.any():
+        return None
+    row, i = np.argwhere(invalid)[0]
+    return int(row), feature_names[i]
+
+@lru_cache(maxsize=4096)
+def cached_inference(features_key):
+    """Class probabilities and the scaled row for one raw feature row, keyed by its float32 bytes"""
+    features_array = np.frombuffer(features_key, dtype=np.float32).reshape(1, -1)
+    features_scaled = scale_features(features_array)
+    prediction_prob = forest_predict_proba(features_scaled)[0]
+    # The arrays are shared between callers through the cache
+    prediction_prob.setflags(write=False)
+    features_scaled.setflags(write=False)
+    return prediction_prob, features_scaled[0]
 
 def load_ml_model():
     """Load the trained ML model, scaler, and feature info"""
-    global model, scaler, feature_info
+    global model, scaler, feature_info, feature_names, feature_descriptions, n_features
+    global scaler_mean, scaler_inv_scale
+    global feature_importances, top_feature_importance, feature_importance_chart
+    global compiled_forest, model_size_kb
+    global risk_factor_table, recommendation_table, feature_risk_table
+    global features_body, model_info_body
     
     try:
         # Load model files from the project root
         model_path = os.path.join(project_root, 'nanomaterial_toxicity_model.pkl')
-        scaler_path = os.path.join(project_root, 'feature_scaler.pkl')
-        feature_path = os.path.join(project_root, 'feature_info.pkl')
+        scaler_path = os.path.join(project_root, 'feature_scaler.npz')
+        feature_path = os.path.join(project_root, 'feature_info.json')
         
         # Check if files exist
         if not os.path.exists(model_path):
@@ -53,30 +274,80 @@ def load_ml_model():
             print(f"❌ Feature info file not found: {feature_path}")
             return False
         
-        # Load with error handling for each file
+        # Load the three files concurrently so their disk reads overlap
+        loaders = (
+            ('Model', _load_model_file, model_path),
+            ('Scaler', _load_scaler_file, scaler_path),
+            ('Feature info', _load_feature_info_file, feature_path),
+        )
+        with ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+            futures = [executor.submit(loader, path) for _, loader, path in loaders]
+        
+        # Report each file with its own error message
+        loaded = []
+        for (label, _, _), future in zip(loaders, futures):
+            try:
+                loaded.append(future.result())
+                print(f"✅ {label} loaded successfully")
+            except Exception as e:
+                print(f"❌ Error loading {label.lower()}: {e}")
+                return False
+        model, scaler, feature_info = loaded
+        
+        model_size_kb = os.path.getsize(model_path) / 1024
+        feature_names = tuple(feature_info['names'])
+        feature_descriptions = tuple(feature_info['descriptions'][name] for name in feature_names)
+        n_features = len(feature_names)
+        
+        risk_factor_table = compile_threshold_rules(RISK_FACTOR_RULES)
+        recommendation_table = compile_threshold_rules(RECOMMENDATION_RULES)
+        feature_risk_table = compile_threshold_rules(FEATURE_RISK_RULES)
+        
+        # StandardScaler parameters as float32 for the fused scaling in
+        # scale_features, which is also the dtype the trees compare against
+        scaler_mean = np.asarray(scaler['mean'], dtype=np.float32)
+        scaler_inv_scale = (1.0 / np.asarray(scaler['scale'])).astype(np.float32)
+        
+        cached_inference.cache_clear()
+        
+        # Feature importances are fixed for a trained forest, but the sklearn
+        # property recomputes them across every tree on each access, so read
+        # them once and build the per-response summaries here
+        importances = feature_importances = model.feature_importances_
+        ranked = sorted(zip(feature_names, importances), key=lambda x: x[1], reverse=True)
+        top_feature_importance = {k: round(v, 4) for k, v in ranked[:5]}
+        feature_importance_chart = [
+            {'feature': name, 'importance': round(imp * 100, 2)}
+            for name, imp in zip(feature_names, importances)
+        ]
+        
+        # Compile the forest for vectorized inference, falling back to sklearn
+        # if it cannot be converted or disagrees with sklearn on a probe batch
         try:
-            with open(model_path, 'rb') as f:
-                model = pickle.load(f)
-            print("✅ Model loaded successfully")
+            compiled_forest = compile_forest(model)
+            rng = np.random.default_rng(0)
+            probe = rng.normal(size=(64, n_features))
+            # Include missing values so the NaN routing is checked as well
+            probe[rng.random(probe.shape) < 0.05] = np.nan
+            if not np.allclose(forest_predict_proba(probe), model.predict_proba(probe)):
+                raise ValueError('compiled forest does not match sklearn')
+            print("✅ Forest compiled for vectorized inference")
         except Exception as e:
-            print(f"❌ Error loading model: {e}")
-            return False
+            compiled_forest = None
+            print(f"Warning: Using sklearn inference, forest compilation failed: {e}")
         
-        try:
-            with open(scaler_path, 'rb') as f:
-                scaler = pickle.load(f)
-            print("✅ Scaler loaded successfully")
-        except Exception as e:
-            print(f"❌ Error loading scaler: {e}")
-            return False
-            
-        try:
-            with open(feature_path, 'rb') as f:
-                feature_info = pickle.load(f)
-            print("✅ Feature info loaded successfully")
-        except Exception as e:
-            print(f"❌ Error loading feature info: {e}")
-            return False
+        # /features and /model-info never change after loading, so serialize
+        # their bodies once
+        features_body = orjson.dumps(feature_info)
+        model_info_body = orjson.dumps({
+            'model_type': 'Random Forest Classifier',
+            'n_estimators': model.n_estimators,
+            'max_depth': model.max_depth,
+            'n_features': model.n_features_in_,
+            'feature_names': feature_info['names'],
+            'training_accuracy': '86.25%',  # From training results
+            'model_size': f"{model_size_kb:.1f} KB"
+        }, option=orjson.OPT_SERIALIZE_NUMPY)
             
         print("✅ ML Model loaded successfully!")
         return True
@@ -84,15 +355,50 @@ def load_ml_model():
         print(f"❌ Error loading model: {e}")
         return False
 
+def warmup_model():
+    """Run one synthetic prediction so the first real request skips sklearn's cold paths"""
+    try:
+        x = np.zeros((1, model.n_features_in_), dtype=np.float32)
+        forest_predict_proba(scale_features(x))
+        print("✅ Model warmed up")
+    except Exception as e:
+        print(f"Warning: Model warmup failed: {e}")
+
 # Load model on startup with error handling
 try:
-    load_ml_model()
+    if load_ml_model():
+        warmup_model()
 except Exception as e:
     print(f"Warning: Could not load model on startup: {e}")
     model = None
     scaler = None
     feature_info = None
 
+# /health only varies by its timestamp, so serialize everything else once and
+# splice the timestamp in per request
+health_body_prefix = orjson.dumps({
+    'status': 'healthy',
+    'model_loaded': model is not None,
+    'scaler_loaded': scaler is not None,
+    'features_loaded': feature_info is not None
+})[:-1] + b',"timestamp":"'
+
+team_body = orjson.dumps({
+    'project': 'Nanomaterial Toxicity Prediction Using Deep Learning',
+    'team': [
+        {'name': 'Adnan Qureshi', 'roll': 67, 'role': 'Lead Developer'},
+        {'name': 'Chirayu Giri', 'roll': 68, 'role': 'ML Engineer'},
+        {'name': 'Abdul Adeen', 'roll': 69, 'role': 'Web Developer'}
+    ],
+    'guide': 'Mrs. Sampada Bhonde',
+    'institution': 'Deep Learning Course Project',
+    'year': '2025'
+})
+
+def json_body_response(body):
+    """Response for an already serialized JSON body"""
+    return app.response_class(body, mimetype='application/json')
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -126,8 +432,8 @@ def serve_static(filename):
 @app.route('/features')
 def get_features():
     """Get feature information for the frontend"""
-    if feature_info:
-        return jsonify(feature_info)
+    if features_body:
+        return json_body_response(features_body)
     else:
         return jsonify({'error': 'Model not loaded'}), 500
 
@@ -137,94 +443,79 @@ def predict():
     if not model or not scaler or not feature_info:
         return jsonify({'error': 'Model not loaded properly'}), 500
     
+    # The status log only feeds the UI's step-by-step animation, so it is
+    # built only in debug mode or when the client asks for it with ?trace=1
+    # or "trace", and only then included in responses
+    trace = app.debug or request.args.get('trace') == '1'
+    status_log = []
+    
+    def error_response(message, status_code):
+        error = {'error': message}
+        if trace:
+            error['status_log'] = status_log
+        return jsonify(error), status_code
+    
     try:
         # Get input data
-        data = request.get_json()
-        
-        # Create status log for real-time updates
-        status_log = []
-        start_time = time.time()
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return error_response('Expected a JSON object of feature values', 400)
+        
+        trace = trace or bool(data.get('trace'))
+        start_ns = time.monotonic_ns()
+        
+        def log_status(step, message, status):
+            if trace:
+                status_log.append({
+                    'step': step,
+                    'message': message,
+                    'timestamp': (time.monotonic_ns() - start_ns) / 1e9,
+                    'status': status
+                })
         
         # Step 1: Data validation
-        status_log.append({
-            'step': 'validation',
-            'message': 'Validating input parameters...',
-            'timestamp': time.time() - start_time,
-            'status': 'processing'
-        })
+        log_status('validation', 'Validating input parameters...', 'processing')
         
-        # Extract features in correct order
-        features = []
-        feature_names = feature_info['names']
-        
-        for feature_name in feature_names:
-            if feature_name in data:
-                value = float(data[feature_name])
-                features.append(value)
-            else:
-                return jsonify({
-                    'error': f'Missing feature: {feature_name}',
-                    'status_log': status_log
-                }), 400
-        
-        status_log.append({
-            'step': 'validation',
-            'message': '✅ Input validation completed',
-            'timestamp': time.time() - start_time,
-            'status': 'completed'
-        })
+        # Extract features in correct order straight into the input buffer
+        features_array = feature_buffer()
+        
+        for i, feature_name in enumerate(feature_names):
+            try:
+                features_array[0, i] = float(data[feature_name])
+            except KeyError:
+                return error_response(f'Missing feature: {feature_name}', 400)
+            except (TypeError, ValueError):
+                return error_response(f'Invalid value for {feature_name}: must be a number', 400)
+        
+        invalid = non_finite_feature(features_array)
+        if invalid:
+            return error_response(f'Invalid value for {invalid[1]}: must be a finite number', 400)
+        
+        log_status('validation', '✅ Input validation completed', 'completed')
         
         # Step 2: Feature preprocessing
-        status_log.append({
-            'step': 'preprocessing',
-            'message': 'Normalizing features using StandardScaler...',
-            'timestamp': time.time() - start_time,
-            'status': 'processing'
-        })
+        log_status('preprocessing', 'Normalizing features using StandardScaler...', 'processing')
         
-        # Scale features
-        features_array = np.array(features).reshape(1, -1)
-        features_scaled = scaler.transform(features_array)
+        # Scaling and inference are memoized on the raw feature values
+        features_key = features_array[0].astype(np.float32).tobytes()
         
-        status_log.append({
-            'step': 'preprocessing',
-            'message': '✅ Feature scaling completed',
-            'timestamp': time.time() - start_time,
-            'status': 'completed'
-        })
+        log_status('preprocessing', '✅ Feature scaling completed', 'completed')
         
         # Step 3: Model prediction
-        status_log.append({
-            'step': 'prediction',
-            'message': 'Running Random Forest model inference...',
-            'timestamp': time.time() - start_time,
-            'status': 'processing'
-        })
+        log_status('prediction', 'Running Random Forest model inference...', 'processing')
         
-        # Make prediction
-        prediction_prob = model.predict_proba(features_scaled)[0]
-        prediction_class = model.predict(features_scaled)[0]
+        # Make prediction; the class is the argmax of the probabilities, which
+        # avoids a second traversal of every tree through model.predict
+        prediction_prob, _ = cached_inference(features_key)
+        prediction_class = int(np.argmax(prediction_prob))
         
-        # Get feature importance for this prediction
-        feature_importance = dict(zip(feature_names, model.feature_importances_))
-        
-        status_log.append({
-            'step': 'prediction',
-            'message': '✅ Model inference completed',
-            'timestamp': time.time() - start_time,
-            'status': 'completed'
-        })
+        log_status('prediction', '✅ Model inference completed', 'completed')
         
         # Step 4: Result interpretation
-        status_log.append({
-            'step': 'interpretation',
-            'message': 'Analyzing prediction results...',
-            'timestamp': time.time() - start_time,
-            'status': 'processing'
-        })
+        log_status('interpretation', 'Analyzing prediction results...', 'processing')
         
         # Calculate confidence and risk factors
-        confidence = max(prediction_prob) * 100
+        confidence = prediction_prob.max() * 100
         non_toxic_prob = prediction_prob[0] * 100
         toxic_prob = prediction_prob[1] * 100
         
@@ -236,51 +527,104 @@ def predict():
             risk_level = 'Medium'
         
         # Key risk factors
-        risk_factors = []
-        if data.get('particle_size_nm', 0) < 50:
-            risk_factors.append('Small particle size increases bioavailability')
-        if data.get('surface_area_m2g', 0) > 100:
-            risk_factors.append('High surface area enhances reactivity')
-        if data.get('concentration_mgl', 0) > 100:
-            risk_factors.append('High concentration increases exposure risk')
-        if data.get('material_type', 0) == 1:
-            risk_factors.append('Metal nanoparticles can have higher toxicity')
-        if data.get('aspect_ratio', 1) > 10:
-            risk_factors.append('High aspect ratio (fiber-like) may cause inflammation')
-        
-        status_log.append({
-            'step': 'interpretation',
-            'message': '✅ Result analysis completed',
-            'timestamp': time.time() - start_time,
-            'status': 'completed'
-        })
+        risk_factors = match_threshold_rules(risk_factor_table, features_array[0])
+        
+        log_status('interpretation', '✅ Result analysis completed', 'completed')
         
         # Final result
-        total_time = time.time() - start_time
+        total_time = (time.monotonic_ns() - start_ns) / 1e9
         
         result = {
-            'prediction': int(prediction_class),
+            'prediction': prediction_class,
             'prediction_text': 'Toxic' if prediction_class == 1 else 'Non-Toxic',
-            'confidence': round(confidence, 2),
+            'confidence': confidence,
             'probabilities': {
-                'non_toxic': round(non_toxic_prob, 2),
-                'toxic': round(toxic_prob, 2)
+                'non_toxic': non_toxic_prob,
+                'toxic': toxic_prob
             },
             'risk_level': risk_level,
             'risk_factors': risk_factors,
-            'feature_importance': {k: round(v, 4) for k, v in sorted(feature_importance.items(), key=lambda x: x[1], reverse=True)[:5]},
-            'processing_time': round(total_time, 3),
-            'status_log': status_log,
+            'feature_importance': top_feature_importance,
+            'processing_time': total_time,
             'timestamp': datetime.now().isoformat()
         }
+        if trace:
+            result['status_log'] = status_log
         
         return jsonify(result)
         
     except Exception as e:
+        return error_response(f'Prediction failed: {str(e)}', 500)
+
+@app.route('/predict-batch', methods=['POST'])
+def predict_batch():
+    """Predict toxicity for many samples with a single model call"""
+    if not model or not scaler or not feature_info:
+        return jsonify({'error': 'Model not loaded properly'}), 500
+    
+    try:
+        data = request.get_json(silent=True)
+        start_ns = time.monotonic_ns()
+        
+        # Accept either a bare list of samples or {"samples": [...]}
+        samples = data.get('samples') if isinstance(data, dict) else data
+        if not isinstance(samples, list) or not samples:
+            return jsonify({'error': 'Expected a non-empty list of samples'}), 400
+        if len(samples) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'Too many samples: {len(samples)} (maximum {MAX_BATCH_SIZE})'}), 413
+        
+        # Stack every sample into one (N, n_features) float32 array, the
+        # dtype the trees compare in, and scale it in place
+        features_array = np.empty((len(samples), n_features), dtype=np.float32)
+        for row, sample in enumerate(samples):
+            if not isinstance(sample, dict):
+                return jsonify({'error': f'Sample {row} must be an object of feature values'}), 400
+            for i, feature_name in enumerate(feature_names):
+                try:
+                    features_array[row, i] = float(sample[feature_name])
+                except KeyError:
+                    return jsonify({'error': f'Missing feature: {feature_name} in sample {row}'}), 400
+                except (TypeError, ValueError):
+                    return jsonify({'error': f'Invalid value for {feature_name} in sample {row}: must be a number'}), 400
+        
+        invalid = non_finite_feature(features_array)
+        if invalid:
+            return jsonify({'error': f'Invalid value for {invalid[1]} in sample {invalid[0]}: must be a finite number'}), 400
+        
+        features_scaled = scale_features(features_array, copy=False)
+        prediction_probs = forest_predict_proba(features_scaled)
+        prediction_classes = prediction_probs.argmax(axis=1)
+        
+        predictions = []
+        for row, (prediction_prob, prediction_class) in enumerate(zip(prediction_probs, prediction_classes)):
+            toxic_prob = prediction_prob[1] * 100
+            risk_level = 'Low'
+            if toxic_prob > 70:
+                risk_level = 'High'
+            elif toxic_prob > 40:
+                risk_level = 'Medium'
+            
+            predictions.append({
+                'index': row,
+                'prediction': prediction_class,
+                'prediction_text': 'Toxic' if prediction_class == 1 else 'Non-Toxic',
+                'confidence': prediction_prob.max() * 100,
+                'probabilities': {
+                    'non_toxic': prediction_prob[0] * 100,
+                    'toxic': toxic_prob
+                },
+                'risk_level': risk_level
+            })
+        
         return jsonify({
-            'error': f'Prediction failed: {str(e)}',
-            'status_log': status_log if 'status_log' in locals() else []
-        }), 500
+            'predictions': predictions,
+            'count': len(predictions),
+            'processing_time': (time.monotonic_ns() - start_ns) / 1e9,
+            'timestamp': datetime.now().isoformat()
+        })
+        
+    except Exception as e:
+        return jsonify({'error': f'Batch prediction failed: {str(e)}'}), 500
 
 @app.route('/detailed-analysis', methods=['POST'])
 def detailed_analysis():
@@ -289,34 +633,39 @@ def detailed_analysis():
         return jsonify({'error': 'Model not loaded properly'}), 500
     
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Expected a JSON object of feature values'}), 400
         
-        # Extract features
-        features = []
-        feature_names = feature_info['names']
+        # Extract features in correct order straight into the input buffer
+        features_array = feature_buffer()
         
-        for feature_name in feature_names:
-            if feature_name in data:
-                value = float(data[feature_name])
-                features.append(value)
-            else:
+        for i, feature_name in enumerate(feature_names):
+            try:
+                features_array[0, i] = float(data[feature_name])
+            except KeyError:
                 return jsonify({'error': f'Missing feature: {feature_name}'}), 400
+            except (TypeError, ValueError):
+                return jsonify({'error': f'Invalid value for {feature_name}: must be a number'}), 400
+        
+        invalid = non_finite_feature(features_array)
+        if invalid:
+            return jsonify({'error': f'Invalid value for {invalid[1]}: must be a finite number'}), 400
+        features = features_array[0]
         
-        # Scale features and make prediction
-        features_array = np.array(features).reshape(1, -1)
-        features_scaled = scaler.transform(features_array)
-        prediction_prob = model.predict_proba(features_scaled)[0]
-        prediction_class = model.predict(features_scaled)[0]
+        # Scale features and make prediction, shared with /predict through the cache
+        prediction_prob, features_scaled = cached_inference(features.astype(np.float32).tobytes())
+        prediction_class = int(np.argmax(prediction_prob))
         
         # Generate comprehensive analysis
         analysis = {
             'prediction': {
-                'class': int(prediction_class),
+                'class': prediction_class,
                 'text': 'Toxic' if prediction_class == 1 else 'Non-Toxic',
-                'confidence': round(max(prediction_prob) * 100, 2),
+                'confidence': prediction_prob.max() * 100,
                 'probabilities': {
-                    'non_toxic': round(prediction_prob[0] * 100, 2),
-                    'toxic': round(prediction_prob[1] * 100, 2)
+                    'non_toxic': prediction_prob[0] * 100,
+                    'toxic': prediction_prob[1] * 100
                 }
             },
             'feature_analysis': {},
@@ -330,28 +679,26 @@ def detailed_analysis():
             'charts_data': {}
         }
         
-        # Feature-by-feature analysis
-        for i, (name, value) in enumerate(zip(feature_names, features)):
-            desc = feature_info['descriptions'][name]
-            importance = model.feature_importances_[i]
+        # Risk level per feature position from the compiled threshold table
+        risk_levels = ['Low'] * n_features
+        hits = threshold_rule_hits(feature_risk_table, features)
+        for i, level in zip(feature_risk_table['index'][hits].tolist(), feature_risk_table['outcomes'][hits]):
+            risk_levels[i] = level
+        
+        # Feature-by-feature analysis, counting risk levels as we go
+        risk_counts = {'Low': 0, 'Medium': 0, 'High': 0}
+        feature_analysis = analysis['feature_analysis']
+        for name, value, desc, importance, risk_level, normalized_value in zip(
+            feature_names, features, feature_descriptions, feature_importances, risk_levels, features_scaled
+        ):
+            risk_counts[risk_level] += 1
             
-            # Risk assessment per feature
-            risk_level = 'Low'
-            if name == 'particle_size_nm' and value < 50:
-                risk_level = 'High'
-            elif name == 'surface_area_m2g' and value > 200:
-                risk_level = 'Medium'
-            elif name == 'concentration_mgl' and value > 500:
-                risk_level = 'High'
-            elif name == 'zeta_potential_mv' and abs(value) < 15:
-                risk_level = 'Medium'
-            
-            analysis['feature_analysis'][name] = {
+            feature_analysis[name] = {
                 'value': value,
                 'description': desc,
-                'importance': round(importance, 4),
+                'importance': importance,
                 'risk_level': risk_level,
-                'normalized_value': round(features_scaled[0][i], 3)
+                'normalized_value': normalized_value
             }
         
         # Risk assessment
@@ -361,15 +708,7 @@ def detailed_analysis():
             analysis['risk_assessment']['overall_risk'] = 'Medium'
         
         # Generate recommendations
-        recommendations = []
-        if data.get('particle_size_nm', 0) < 50:
-            recommendations.append('Consider larger particle sizes to reduce bioavailability')
-        if data.get('concentration_mgl', 0) > 500:
-            recommendations.append('Reduce concentration to minimize exposure risk')
-        if data.get('surface_area_m2g', 0) > 200:
-            recommendations.append('Monitor surface reactivity due to high surface area')
-        
-        analysis['risk_assessment']['safety_recommendations'] = recommendations
+        analysis['risk_assessment']['safety_recommendations'] = match_threshold_rules(recommendation_table, features)
         
         # Chart data for visualization
         analysis['charts_data'] = {
@@ -377,14 +716,11 @@ def detailed_analysis():
                 {'label': 'Non-Toxic', 'value': analysis['prediction']['probabilities']['non_toxic']},
                 {'label': 'Toxic', 'value': analysis['prediction']['probabilities']['toxic']}
             ],
-            'feature_importance': [
-                {'feature': name, 'importance': round(imp * 100, 2)} 
-                for name, imp in zip(feature_names, model.feature_importances_)
-            ],
+            'feature_importance': feature_importance_chart,
             'risk_distribution': [
-                {'category': 'Low Risk Features', 'count': sum(1 for f in analysis['feature_analysis'].values() if f['risk_level'] == 'Low')},
-                {'category': 'Medium Risk Features', 'count': sum(1 for f in analysis['feature_analysis'].values() if f['risk_level'] == 'Medium')},
-                {'category': 'High Risk Features', 'count': sum(1 for f in analysis['feature_analysis'].values() if f['risk_level'] == 'High')}
+                {'category': 'Low Risk Features', 'count': risk_counts['Low']},
+                {'category': 'Medium Risk Features', 'count': risk_counts['Medium']},
+                {'category': 'High Risk Features', 'count': risk_counts['High']}
             ]
         }
         
@@ -396,36 +732,14 @@ def detailed_analysis():
 @app.route('/model-info')
 def model_info():
     """Get information about the trained model"""
-    if not model:
+    if not model or not model_info_body:
         return jsonify({'error': 'Model not loaded'}), 500
     
-    try:
-        info = {
-            'model_type': 'Random Forest Classifier',
-            'n_estimators': model.n_estimators,
-            'max_depth': model.max_depth,
-            'n_features': model.n_features_in_,
-            'feature_names': feature_info['names'] if feature_info else [],
-            'training_accuracy': '86.25%',  # From training results
-            'model_size': f"{len(pickle.dumps(model)) / 1024:.1f} KB"
-        }
-        return jsonify(info)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    return json_body_response(model_info_body)
 
 @app.route('/team')
 def team():
-    return jsonify({
-        'project': 'Nanomaterial Toxicity Prediction Using Deep Learning',
-        'team': [
-            {'name': 'Adnan Qureshi', 'roll': 67, 'role': 'Lead Developer'},
-            {'name': 'Chirayu Giri', 'roll': 68, 'role': 'ML Engineer'},
-            {'name': 'Abdul Adeen', 'roll': 69, 'role': 'Web Developer'}
-        ],
-        'guide': 'Mrs. Sampada Bhonde',
-        'institution': 'Deep Learning Course Project',
-        'year': '2025'
-    })
+    return json_body_response(team_body)
 
 @app.route('/debug')
 def debug_info():
@@ -462,13 +776,7 @@ def debug_info():
 @app.route('/health')
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'model_loaded': model is not None,
-        'scaler_loaded': scaler is not None,
-        'features_loaded': feature_info is not None,
-        'timestamp': datetime.now().isoformat()
-    })
+    return json_body_response(health_body_prefix + datetime.now().isoformat().encode() + b'"}')
 
 @app.errorhandler(404)
 def not_found(error):
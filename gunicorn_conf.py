@@ -0,0 +1,15 @@
+# Gunicorn configuration for running the Flask app outside Vercel
+#   gunicorn -c gunicorn_conf.py api.index:app
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:8080')
+
+# Import the app (and load the model) once in the master process; forked
+# workers start with the loaded model instead of each loading it again
+preload_app = True
+
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = 30
@@ -294,7 +294,7 @@ class ToxicityPredictor {
     
     async makePrediction(formData) {
         try {
-            const response = await fetch('/predict', {
+            const response = await fetch('/predict?trace=1', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json'
@@ -466,15 +466,15 @@ class ToxicityPredictor {
                     ${result.prediction_text}
                 </div>
                 <div class=\"prediction-confidence\">
-                    Confidence: ${result.confidence}%
+                    Confidence: ${result.confidence.toFixed(2)}%
                 </div>
                 <div class=\"prediction-probabilities\">
                     <div class=\"probability-item\">
-                        <div class=\"probability-value\">${result.probabilities.non_toxic}%</div>
+                        <div class=\"probability-value\">${result.probabilities.non_toxic.toFixed(2)}%</div>
                         <div class=\"probability-label\">Non-Toxic</div>
                     </div>
                     <div class=\"probability-item\">
-                        <div class=\"probability-value\">${result.probabilities.toxic}%</div>
+                        <div class=\"probability-value\">${result.probabilities.toxic.toFixed(2)}%</div>
                         <div class=\"probability-label\">Toxic</div>
                     </div>
                 </div>
@@ -506,7 +506,7 @@ class ToxicityPredictor {
                 
                 <div class=\"detail-card\">
                     <h4><i class=\"fas fa-info-circle\"></i> Analysis Info</h4>
-                    <p><strong>Processing Time:</strong> ${result.processing_time}s</p>
+                    <p><strong>Processing Time:</strong> ${result.processing_time.toFixed(3)}s</p>
                     <p><strong>Analysis Date:</strong> ${new Date(result.timestamp).toLocaleString()}</p>
                     <p><strong>Model Type:</strong> Random Forest</p>
                     <p><strong>Features Analyzed:</strong> ${this.features.names.length}</p>
@@ -522,7 +522,7 @@ class ToxicityPredictor {
                 <div class="analysis-card">
                     <h3>🎯 Prediction</h3>
                     <div class="metric">${analysis.prediction.text}</div>
-                    <div class="description">${analysis.prediction.confidence}% confidence</div>
+                    <div class="description">${analysis.prediction.confidence.toFixed(2)}% confidence</div>
                 </div>
                 <div class="analysis-card">
                     <h3>⚠️ Risk Level</h3>
@@ -548,18 +548,18 @@ class ToxicityPredictor {
                     <div id="probabilityChart" class="pie-chart">
                         <div class="pie-visual" id="pieVisual">
                             <div class="pie-center">
-                                <div class="pie-percentage">${analysis.prediction.probabilities.toxic}%</div>
+                                <div class="pie-percentage">${analysis.prediction.probabilities.toxic.toFixed(2)}%</div>
                                 <div class="pie-label">Toxic</div>
                             </div>
                         </div>
                         <div class="pie-legend">
                             <div class="legend-item">
                                 <div class="legend-color" style="background: var(--success-color);"></div>
-                                <div class="legend-text">Non-Toxic (${analysis.prediction.probabilities.non_toxic}%)</div>
+                                <div class="legend-text">Non-Toxic (${analysis.prediction.probabilities.non_toxic.toFixed(2)}%)</div>
                             </div>
                             <div class="legend-item">
                                 <div class="legend-color" style="background: var(--danger-color);"></div>
-                                <div class="legend-text">Toxic (${analysis.prediction.probabilities.toxic}%)</div>
+                                <div class="legend-text">Toxic (${analysis.prediction.probabilities.toxic.toFixed(2)}%)</div>
                             </div>
                         </div>
                     </div>
@@ -615,7 +615,7 @@ class ToxicityPredictor {
                                 </div>
                                 <div class="feature-detail">
                                     <span class="detail-label">Normalized</span>
-                                    <span class="detail-value">${data.normalized_value}</span>
+                                    <span class="detail-value">${data.normalized_value.toFixed(3)}</span>
                                 </div>
                                 <div class="feature-detail">
                                     <span class="detail-label">Importance</span>
@@ -4,9 +4,10 @@ Deployment verification script for Vercel
 Tests the deployed API endpoints
 """
 
+import argparse
 import requests
 import json
-import sys
+import time
 
 def test_vercel_deployment(base_url):
     """Test the deployed API on Vercel"""
@@ -66,7 +67,7 @@ def test_vercel_deployment(base_url):
             result = response.json()
             print("   ✅ Prediction endpoint working")
             print(f"   🎯 Prediction: {result.get('prediction_text', 'Unknown')}")
-            print(f"   📈 Confidence: {result.get('confidence', 0)}%")
+            print(f"   📈 Confidence: {result.get('confidence', 0):.2f}%")
         else:
             print(f"   ❌ Prediction failed: {response.status_code}")
             print(f"   Response: {response.text}")
@@ -76,13 +77,35 @@ def test_vercel_deployment(base_url):
     print("\n✅ Deployment verification completed!")
     return True
 
+def keep_warm(base_url, interval):
+    """Ping the health endpoint periodically so Vercel keeps the function warm"""
+    print(f"🔥 Keeping {base_url} warm every {interval:g}s (Ctrl+C to stop)")
+    try:
+        while True:
+            try:
+                response = requests.get(f"{base_url}/health", timeout=5)
+                print(f"   {time.strftime('%H:%M:%S')} health: {response.status_code}")
+            except Exception as e:
+                print(f"   {time.strftime('%H:%M:%S')} health error: {e}")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped keep-warm pings")
+
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        url = sys.argv[1]
-    else:
+    parser = argparse.ArgumentParser(description="Verify a Vercel deployment of the toxicity prediction API")
+    parser.add_argument('url', nargs='?', help="Deployment URL (e.g., https://your-app.vercel.app)")
+    parser.add_argument('--keep-warm-interval', type=float, metavar='SECONDS',
+                        help="After verifying, keep pinging /health at this interval to avoid cold starts")
+    args = parser.parse_args()
+    
+    url = args.url
+    if not url:
         url = input("Enter your Vercel deployment URL (e.g., https://your-app.vercel.app): ").strip()
     
     if not url.startswith('http'):
         url = f"https://{url}"
     
     test_vercel_deployment(url)
+    
+    if args.keep_warm_interval:
+        keep_warm(url, args.keep_warm_interval)